@@ -12,6 +12,7 @@ setup(
         "singer-python>=5.0.12",
         "smart_open>=2.1",
         "voluptuous>=0.10.5",
+        "fastjsonschema>=2.16",
         "boto3>=1.15.5",
         "google-cloud-storage>=2.7.0",
         "protobuf>=4.21.12",
@@ -62,10 +62,11 @@ def discover(config):
     for table_spec in config['tables']:
         try:
             modified_since = dateutil.parser.parse(table_spec['start_date'])
-            target_files = file_utils.get_matching_objects(table_spec, modified_since)
             sample_rate = table_spec.get('sample_rate',5)
             max_sampling_read = table_spec.get('max_sampling_read', 1000)
             max_sampled_files = table_spec.get('max_sampled_files', 50)
+            # Only the oldest max_sampled_files will be sampled, so cap the listing there
+            target_files = file_utils.get_matching_objects(table_spec, modified_since, limit=max_sampled_files)
             samples = file_utils.sample_files(table_spec, target_files,
                                               table_spec.get("ignore_undefined_field_names", False),
                                               sample_rate=sample_rate, max_records=max_sampling_read,
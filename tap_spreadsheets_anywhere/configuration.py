@@ -2,7 +2,7 @@
 import json
 import logging
 
-from voluptuous import Schema, Required, Any, Optional
+from voluptuous import Schema, Required, Any, Optional, Invalid
 LOGGER = logging.getLogger(__name__)
 
 CONFIG_CONTRACT = Schema({
@@ -20,6 +20,8 @@ CONFIG_CONTRACT = Schema({
         Optional('selected'): bool,
         Optional('field_names'): [str],
         Optional('search_prefix'): str,
+        Optional('s3_list_concurrency'): int,
+        Optional('transport_params'): dict,
         Optional('worksheet_name'): str,
         Optional('delimiter'): str,
         Optional('quotechar'): str,
@@ -45,6 +47,151 @@ CONFIG_CONTRACT = Schema({
     Optional('aws_secret_access_key'): str,
 })
 
+_OVERRIDE_TYPES = ['null', 'string', 'integer', 'number', 'date-time', 'object']
+
+# JSON Schema translation of CONFIG_CONTRACT so validation can be compiled once
+# at import time instead of re-walking the voluptuous schema tree on every call.
+JSON_SCHEMA_CONTRACT = {
+    'type': 'object',
+    'properties': {
+        'tables': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'path': {'type': 'string'},
+                    'name': {'type': 'string'},
+                    'pattern': {'type': 'string'},
+                    'start_date': {'type': 'string'},
+                    'key_properties': {'type': 'array', 'items': {'type': 'string'}},
+                    'format': {'enum': ['csv', 'excel', 'json', 'jsonl', 'detect']},
+                    'encoding': {'type': 'string'},
+                    'invalid_format_action': {'enum': ['ignore', 'fail']},
+                    'universal_newlines': {'type': 'boolean'},
+                    'skip_initial': {'type': 'integer'},
+                    'selected': {'type': 'boolean'},
+                    'field_names': {'type': 'array', 'items': {'type': 'string'}},
+                    'search_prefix': {'type': 'string'},
+                    's3_list_concurrency': {'type': 'integer'},
+                    'transport_params': {'type': 'object'},
+                    'worksheet_name': {'type': 'string'},
+                    'delimiter': {'type': 'string'},
+                    'quotechar': {'type': 'string'},
+                    'json_path': {'type': 'string'},
+                    'sample_rate': {'type': 'integer'},
+                    'max_sampling_read': {'type': 'integer'},
+                    'max_records_per_run': {'type': 'integer'},
+                    'max_sampled_files': {'type': 'integer'},
+                    'prefer_number_vs_integer': {'type': 'boolean'},
+                    'prefer_schema_as_string': {'type': 'boolean'},
+                    'schema_overrides': {
+                        'type': 'object',
+                        'additionalProperties': {
+                            'type': 'object',
+                            'properties': {
+                                'type': {'anyOf': [
+                                    {'enum': _OVERRIDE_TYPES},
+                                    {'type': 'array', 'items': {'enum': _OVERRIDE_TYPES}},
+                                ]},
+                            },
+                            'required': ['type'],
+                        },
+                    },
+                    'ignore_undefined_field_names': {'type': 'boolean'},
+                    'ignore_state': {'type': 'boolean'},
+                    'skip_empty_rows': {'type': 'boolean'},
+                },
+                'required': ['path', 'name', 'pattern', 'start_date', 'key_properties', 'format'],
+                'additionalProperties': False,
+            },
+        },
+        'azure_storage_connection_string': {'type': 'string'},
+        'aws_access_key_id': {'type': 'string'},
+        'aws_secret_access_key': {'type': 'string'},
+    },
+    'required': ['tables'],
+    'additionalProperties': False,
+}
+
+def _compile_spec(spec):
+    """Build a specialized checker for one node of the CONFIG_CONTRACT spec.
+
+    The contract tree is walked exactly once (at import) and turned into nested
+    closures that hardcode the known keys, required-field lists and enum
+    memberships, so each validate() call skips voluptuous's generic dispatch.
+    """
+    if isinstance(spec, type):
+        def check_type(value, path):
+            if not isinstance(value, spec):
+                raise Invalid(f"expected {spec.__name__} @ data[{path}]")
+        return check_type
+    if isinstance(spec, Any):
+        literals = frozenset(v for v in spec.validators if isinstance(v, str))
+        nested = [_compile_spec(v) for v in spec.validators if not isinstance(v, str)]
+        def check_any(value, path):
+            if isinstance(value, str) and value in literals:
+                return
+            for check in nested:
+                try:
+                    check(value, path)
+                    return
+                except Invalid:
+                    continue
+            raise Invalid(f"not a valid value @ data[{path}]")
+        return check_any
+    if isinstance(spec, list):
+        check_item = _compile_spec(spec[0])
+        def check_list(value, path):
+            if not isinstance(value, list):
+                raise Invalid(f"expected a list @ data[{path}]")
+            for index, item in enumerate(value):
+                check_item(item, f"{path}[{index}]")
+        return check_list
+    if isinstance(spec, dict):
+        if len(spec) == 1 and next(iter(spec)) is str:
+            # Mapping with arbitrary string keys (e.g. schema_overrides)
+            check_value = _compile_spec(next(iter(spec.values())))
+            def check_mapping(value, path):
+                if not isinstance(value, dict):
+                    raise Invalid(f"expected a dictionary @ data[{path}]")
+                for key, item in value.items():
+                    if not isinstance(key, str):
+                        raise Invalid(f"expected str keys @ data[{path}]")
+                    check_value(item, f"{path}.{key}")
+            return check_mapping
+        required = tuple(str(key) for key in spec if isinstance(key, Required))
+        checks = {str(key): _compile_spec(value) for key, value in spec.items()}
+        def check_dict(value, path):
+            if not isinstance(value, dict):
+                raise Invalid(f"expected a dictionary @ data[{path}]")
+            for key in required:
+                if key not in value:
+                    raise Invalid(f"required key not provided: {key} @ data[{path}]")
+            for key, item in value.items():
+                check = checks.get(key)
+                if check is None:
+                    raise Invalid(f"extra keys not allowed: {key} @ data[{path}]")
+                check(item, f"{path}.{key}" if path else key)
+        return check_dict
+    raise ValueError(f"Unsupported contract spec: {spec!r}")
+
+
+def _compile_contract(contract):
+    check = _compile_spec(contract.schema)
+    def validate_fn(config_json):
+        check(config_json, '')
+        return config_json
+    return validate_fn
+
+
+try:
+    import fastjsonschema
+    _VALIDATE_FN = fastjsonschema.compile(JSON_SCHEMA_CONTRACT)
+except ImportError:
+    # Fall back to a one-time specialization of the voluptuous contract
+    _VALIDATE_FN = _compile_contract(CONFIG_CONTRACT)
+
+
 class Config():
 
     @classmethod
@@ -53,7 +200,7 @@ class Config():
 
     @classmethod
     def validate(cls, config_json):
-        CONFIG_CONTRACT(config_json)
+        _VALIDATE_FN(config_json)
         return config_json
 
     @classmethod
@@ -1,73 +1,118 @@
+import asyncio
+import heapq
 import re
 
-import pytz
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 
-import dateutil
-import requests
 import singer
-import boto3
-from google.cloud import storage
 import os, logging
-from os import walk
 import tap_spreadsheets_anywhere.format_handler
 import tap_spreadsheets_anywhere.conversion as conversion
-import smart_open.ssh as ssh_transport
-from azure.storage.blob import BlobServiceClient
-import smart_open.ftp as ftp_transport
+
+# The transport SDKs (boto3, google-cloud-storage, azure, paramiko, requests)
+# each cost hundreds of ms of import time and MBs of memory, so they are
+# imported lazily by the listing function that needs them.
 
 LOGGER = logging.getLogger(__name__)
 
+try:
+    # Optional: google-re2 matches in native code without backtracking, which is
+    # noticeably faster when filtering very large bucket listings.
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+
+def _build_key_matcher(pattern):
+    """Return a callable that tests an object key against the table's pattern,
+    using re2 when installed and falling back to stdlib re otherwise.
+
+    Note the search_prefix is already applied server-side by the listing
+    functions, so only the pattern needs to be matched here.
+    """
+    try:
+        return _re_engine.compile(pattern).search
+    except re.error:
+        raise
+    except Exception:
+        # re2 rejects some constructs (e.g. backreferences); fall back to stdlib
+        return re.compile(pattern).search
+
 
 def resolve_target_uri(table_spec, target_filename):
-    protocol, bucket = parse_path(table_spec['path'])
+    return _resolve_target_uri_cached(table_spec['path'], table_spec['pattern'], target_filename)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_target_uri_cached(path, pattern, target_filename):
+    protocol, bucket = parse_path(path)
     # TODO: logic below is disabled because we can't currently support reading filenames from Content-Disposition (Excel limitations)
-    if False and protocol in ["http", "https"] and table_spec['pattern'] != target_filename:
+    if False and protocol in ["http", "https"] and pattern != target_filename:
         # Handle case where URL returns a filename in the response so we do NOT append the pattern to get the URI
-        return table_spec['path']
+        return path
     else:
-        return table_spec['path'] + "/" + target_filename
+        return path + "/" + target_filename
+
+
+_SFTP_CRED_RE = re.compile('sftp://.*?@', re.DOTALL)
+_FTP_CRED_RE = re.compile('ftp://.*?@', re.DOTALL)
 
 
 def _hide_credentials(path):
-    import re
     if path.startswith('sftp'):
-        return re.sub('sftp://.*?@', "********", path, flags=re.DOTALL)
+        return _SFTP_CRED_RE.sub("********", path)
     elif path.startswith('ftp'):
-        return re.sub('ftp://.*?@', "********", path, flags=re.DOTALL)
+        return _FTP_CRED_RE.sub("********", path)
     return path
 
 
+_WRITE_BATCH_SIZE = 1000
+
+
+def _write_record_batch(stream_name, batch, records_synced, target_filename):
+    try:
+        singer.write_records(stream_name, batch)
+    except BrokenPipeError as bpe:
+        LOGGER.error(
+            f'Pipe to loader broke after {records_synced} records were written from {target_filename}: troubled '
+            f'batch was {len(batch)} records ending with {batch[-1]}')
+        raise bpe
+
+
 def write_file(target_filename, table_spec, schema, max_records=-1):
     LOGGER.info('Syncing file "{}".'.format(target_filename))
     target_uri = resolve_target_uri(table_spec, target_filename)
     records_synced = 0
+    batch = []
+    stream_name = table_spec['name']
+    ignore_invalid = table_spec.get('invalid_format_action', 'fail').lower() == 'ignore'
+    base_metadata = {
+        '_smart_source_bucket': _hide_credentials(table_spec['path']),
+        '_smart_source_file': target_filename,
+    }
     try:
         iterator = tap_spreadsheets_anywhere.format_handler.get_row_iterator(table_spec, target_uri)
         for row in iterator:
-            metadata = {
-                '_smart_source_bucket': _hide_credentials(table_spec['path']),
-                '_smart_source_file': target_filename,
-                # index zero, +1 for header row
-                '_smart_source_lineno': records_synced + 2
-            }
-
-            try:
-                record_with_meta = {**conversion.convert_row(row, schema), **metadata}
-                singer.write_record(table_spec['name'], record_with_meta)
-            except BrokenPipeError as bpe:
-                LOGGER.error(
-                    f'Pipe to loader broke after {records_synced} records were written from {target_filename}: troubled '
-                    f'line was {record_with_meta}')
-                raise bpe
+            batch.append({**conversion.convert_row(row, schema), **base_metadata,
+                          # index zero, +1 for header row
+                          '_smart_source_lineno': records_synced + 2})
+            if len(batch) >= _WRITE_BATCH_SIZE:
+                _write_record_batch(stream_name, batch, records_synced, target_filename)
+                batch = []
 
             records_synced += 1
             if 0 < max_records <= records_synced:
                 break
 
+        if batch:
+            _write_record_batch(stream_name, batch, records_synced, target_filename)
+
     except tap_spreadsheets_anywhere.format_handler.InvalidFormatError as ife:
-        if table_spec.get('invalid_format_action','fail').lower() == "ignore":
-            LOGGER.exception(f"Ignoring unparseable file: {target_filename}",ife)
+        if ignore_invalid:
+            LOGGER.exception(f"Ignoring unparseable file: {target_filename}")
         else:
             raise ife
 
@@ -81,12 +126,14 @@ def sample_file(table_spec, target_filename, ignore_undefined_field_names, sampl
     target_uri = resolve_target_uri(table_spec,target_filename)
     samples = []
     current_row = 0
+    skip_empty_rows = table_spec.get("skip_empty_rows", False)
+    ignore_invalid = table_spec.get('invalid_format_action', 'fail').lower() == 'ignore'
     try:
         iterator = tap_spreadsheets_anywhere.format_handler.get_row_iterator(table_spec, target_uri)
 
         for row in iterator:
             if (current_row % sample_rate) == 0:
-                if table_spec.get("skip_empty_rows", False) and all(value == None for value in row.values()):
+                if skip_empty_rows and not any(value is not None for value in row.values()):
                     continue
                 else:
                     samples.append(row)
@@ -95,10 +142,10 @@ def sample_file(table_spec, target_filename, ignore_undefined_field_names, sampl
             if len(samples) >= max_records:
                 break
     except tap_spreadsheets_anywhere.format_handler.InvalidFormatError as ife:
-        if table_spec.get('invalid_format_action','fail').lower() != "ignore":
+        if not ignore_invalid:
             raise ife
         else:
-            LOGGER.exception(f"Unable to parse {target_filename}",ife)
+            LOGGER.exception(f"Unable to parse {target_filename}")
 
     if ignore_undefined_field_names:
         for row in samples:
@@ -115,8 +162,8 @@ def sample_files(table_spec, target_files, ignore_undefined_field_names,
     files_so_far = 0
 
     for target_file in target_files:
-        to_return += sample_file(table_spec, target_file['key'], ignore_undefined_field_names,
-                                sample_rate, max_records)
+        to_return.extend(sample_file(table_spec, target_file['key'], ignore_undefined_field_names,
+                                     sample_rate, max_records))
         files_so_far += 1
 
         if files_so_far >= max_files:
@@ -125,17 +172,19 @@ def sample_files(table_spec, target_files, ignore_undefined_field_names,
     return to_return
 
 
+@lru_cache(maxsize=4096)
 def parse_path(path):
     path_parts = path.split('://', 1)
     return ('local', path_parts[0]) if len(path_parts) <= 1 else (path_parts[0], path_parts[1])
 
 
-def get_matching_objects(table_spec, modified_since=None):
+def get_matching_objects(table_spec, modified_since=None, limit=None):
     protocol, bucket = parse_path(table_spec['path'])
 
     # TODO Breakout the transport schemes here similar to the registry/loading pattern used by smart_open
     if protocol == 's3':
-        target_objects = list_files_in_s3_bucket(bucket, table_spec.get('search_prefix'))
+        target_objects = list_files_in_s3_bucket(bucket, table_spec.get('search_prefix'),
+                                                 concurrency=table_spec.get('s3_list_concurrency', 1))
     elif protocol == 'file':
         target_objects = list_files_in_local_bucket(bucket, table_spec.get('search_prefix'))
     elif protocol in ["sftp"]:
@@ -152,19 +201,25 @@ def get_matching_objects(table_spec, modified_since=None):
         raise ValueError("Protocol {} not yet supported. Pull Requests are welcome!")
 
     pattern = table_spec['pattern']
-    matcher = re.compile(pattern)
+    key_matcher = _build_key_matcher(pattern)
     if modified_since:
-        LOGGER.info(f'Checking {len(target_objects)} resolved objects for any that match regular expression "{pattern}" and were modified since {modified_since}')
+        LOGGER.info(f'Checking resolved objects for any that match regular expression "{pattern}" and were modified since {modified_since}')
     else:
-        LOGGER.info(f'Checking {len(target_objects)} resolved objects for any that match regular expression "{pattern}"')
+        LOGGER.info(f'Checking resolved objects for any that match regular expression "{pattern}"')
 
+    # The listing functions are generators, so only the matched subset is
+    # ever materialized here.
     to_return = []
+    checked = 0
+    check_mtime = modified_since is not None
     for obj in target_objects:
+        checked += 1
         key = obj['Key']
         last_modified = obj['LastModified']
 
+        # The O(1) datetime compare runs first so stale keys skip the regex
         # noinspection PyTypeChecker
-        if matcher.search(key) and (modified_since is None or modified_since < last_modified):
+        if (not check_mtime or modified_since < last_modified) and key_matcher(key):
             LOGGER.debug('Including key "{}"'.format(key))
             LOGGER.debug('Last modified: {}'.format(last_modified) + ' comparing to {} '.format(modified_since))
             to_return.append({'key': key, 'last_modified': last_modified})
@@ -172,8 +227,11 @@ def get_matching_objects(table_spec, modified_since=None):
             LOGGER.debug('Not including key "{}"'.format(key))
 
     if not LOGGER.isEnabledFor(logging.DEBUG):
-        LOGGER.info(f'Processing {len(to_return)} resolved objects that met our criteria. Enable debug verbosity logging for more details.')
-    return sorted(to_return, key=lambda item: item['last_modified'])
+        LOGGER.info(f'Processing {len(to_return)} of {checked} resolved objects that met our criteria. Enable debug verbosity logging for more details.')
+    if limit is not None:
+        # O(N log K) when callers only need the K oldest matches
+        return heapq.nsmallest(limit, to_return, key=itemgetter('last_modified'))
+    return sorted(to_return, key=itemgetter('last_modified'))
 
 
 def list_files_in_SSH_bucket(uri, search_prefix=None):
@@ -185,29 +243,35 @@ def list_files_in_SSH_bucket(uri, search_prefix=None):
             '`pip install paramiko` to suppress'
         )
         raise
+    import smart_open.ssh as ssh_transport
 
     parsed_uri = ssh_transport.parse_uri(uri)
     uri_path = parsed_uri.pop('uri_path')
     transport_params={'connect_kwargs':{'allow_agent':False,'look_for_keys':False}}
     ssh = ssh_transport._connect(parsed_uri['host'], parsed_uri['user'], parsed_uri['port'], parsed_uri['password'], transport_params=transport_params)
     sftp_client = ssh.get_transport().open_sftp_client()
-    entries = []
+    count = 0
     max_results = 10000
     from stat import S_ISREG
     import fnmatch
+    # Pre-compile the glob once so we skip fnmatch's per-entry cache lookup
+    matches = re.compile(fnmatch.translate(search_prefix)).match if search_prefix is not None else None
     for entry in sftp_client.listdir_attr(uri_path):
-        if search_prefix is None or fnmatch.fnmatch(entry.filename,search_prefix):
+        if matches is None or matches(entry.filename):
             mode = entry.st_mode
             if S_ISREG(mode):
-                entries.append({'Key':entry.filename,'LastModified':datetime.fromtimestamp(entry.st_mtime, timezone.utc)})
-            if len(entries) > max_results:
-                raise ValueError(f"Read more than {max_results} records from the path {uri_path}. Use a more specific "
-                                 f"search_prefix")
+                count += 1
+                if count > max_results:
+                    raise ValueError(f"Read more than {max_results} records from the path {uri_path}. Use a more specific "
+                                     f"search_prefix")
+                yield {'Key':entry.filename,'LastModified':datetime.fromtimestamp(entry.st_mtime, timezone.utc)}
 
-    LOGGER.info("Found {} files.".format(entries))
-    return entries
+    LOGGER.info("Found {} files.".format(count))
 
 def convert_URL_to_file_list(table_spec):
+    import pytz
+    import requests
+
     url = table_spec["path"] + "/" + table_spec["pattern"]
     LOGGER.info(f"Assembled {url} as the URL to a source file.")
     r = requests.get(url, allow_redirects=True)
@@ -233,112 +297,183 @@ def convert_URL_to_file_list(table_spec):
 
 
 def list_files_in_ftp_server(uri, search_prefix=None):
+    import smart_open.ftp as ftp_transport
+
     parsed_uri = ftp_transport.parse_uri(uri)
     uri_path = parsed_uri.pop('uri_path')
     secure_conn = True if parsed_uri["scheme"] == "ftps" else False
     ftp = ftp_transport._connect(parsed_uri['host'], parsed_uri['user'], parsed_uri['port'], parsed_uri['password'], secure_conn, transport_params={})
-    entries = []
+    count = 0
     max_results = 10000
     from stat import S_ISREG
     import fnmatch
+    # Pre-compile the glob once so we skip fnmatch's per-entry cache lookup
+    matches = re.compile(fnmatch.translate(search_prefix)).match if search_prefix is not None else None
     for row in ftp.mlsd(uri_path):
-        if search_prefix is None or fnmatch.fnmatch(entry[0],search_prefix):
+        if matches is None or matches(row[0]):
             if row[1]['type'] == 'file':
-                entries.append({'Key':row[0],'LastModified':datetime.strptime(row[1]['modify'], '%Y%m%d%H%M%S').replace(tzinfo=timezone.utc)})
-            if len(entries) > max_results:
-                raise print(f"Read more than {max_results} records from the path {uri_path}. Use a more specific "
-                             f"search_prefix")
-
-    LOGGER.info("Found {} files.".format(entries))
-    return entries
+                count += 1
+                if count > max_results:
+                    raise ValueError(f"Read more than {max_results} records from the path {uri_path}. Use a more specific "
+                                     f"search_prefix")
+                yield {'Key':row[0],'LastModified':datetime.strptime(row[1]['modify'], '%Y%m%d%H%M%S').replace(tzinfo=timezone.utc)}
 
-def raise_error(error):
-    raise error
+    LOGGER.info("Found {} files.".format(count))
 
 def list_files_in_local_bucket(bucket, search_prefix=None):
-    local_filenames = []
     path = bucket
     if search_prefix is not None:
         path = os.path.join(bucket, search_prefix)
 
     LOGGER.info(f"Walking {path}.")
     max_results = 10000
-    for (dirpath, dirnames, filenames) in walk(path, onerror=raise_error):
-        for filename in filenames:
-            abspath = os.path.join(dirpath,filename)
-            relpath = os.path.relpath(abspath, path)
-            local_filenames.append(relpath)
-        if len(local_filenames) > max_results:
-            raise ValueError(f"Read more than {max_results} records from the path {path}. Use a more specific "
-                             f"search_prefix")
-
-    LOGGER.info("Found {} files.".format(len(local_filenames)))
-    # for filename in local_filenames:
-    #     LOGGER.info(f"Found {filename} and {os.path.join(path, filename)} exists {os.path.exists(os.path.join(path, filename))}")
-
-    return [{'Key': filename, 'LastModified': datetime.fromtimestamp(os.path.getmtime(os.path.join(path, filename)), timezone.utc)} for
-            filename in local_filenames if os.path.exists(os.path.join(path, filename))]
+    count = 0
+    # Use scandir directly so each entry's mtime comes from the one stat the
+    # directory scan already performs, instead of re-statting per file later.
+    dirs_to_scan = [path]
+    while dirs_to_scan:
+        with os.scandir(dirs_to_scan.pop()) as scan:
+            for entry in scan:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs_to_scan.append(entry.path)
+                elif entry.is_file():
+                    count += 1
+                    if count > max_results:
+                        raise ValueError(f"Read more than {max_results} records from the path {path}. Use a more specific "
+                                         f"search_prefix")
+                    # Follow symlinks so the target's mtime is compared
+                    # against start_date, as os.path.getmtime did
+                    mtime = entry.stat().st_mtime
+                    yield {'Key': os.path.relpath(entry.path, path),
+                           'LastModified': datetime.fromtimestamp(mtime, timezone.utc)}
+
+    LOGGER.info("Found {} files.".format(count))
+
+@lru_cache(maxsize=None)
+def _gs_client():
+    # Constructing a Client re-reads and re-parses the service-account
+    # credential JSON, so build it once per process rather than per listing
+    from google.cloud import storage
+
+    return storage.Client()
+
 
 def list_files_in_gs_bucket(bucket, search_prefix=None):
-    gs_client = storage.Client()
-        
-    blobs = gs_client.list_blobs(bucket, prefix=search_prefix)
+    blobs = _gs_client().list_blobs(bucket, prefix=search_prefix)
 
-    target_objects = [{'Key': blob.name, 'LastModified': blob.updated} for blob in blobs]
-    
-    LOGGER.info("Found {} files.".format(len(target_objects)))
+    count = 0
+    for blob in blobs:
+        count += 1
+        yield {'Key': blob.name, 'LastModified': blob.updated}
 
-    return target_objects
+    LOGGER.info("Found {} files.".format(count))
 
 def list_files_in_azure_bucket(container_name, search_prefix=None):
     sas_key = os.environ['AZURE_STORAGE_CONNECTION_STRING']
-    blob_service_client = BlobServiceClient.from_connection_string(sas_key)
-    container_client = blob_service_client.get_container_client(container_name)
-    blob_iterator = container_client.list_blobs(name_starts_with=search_prefix)
-    return [{'Key': blob.name, 'LastModified': blob.last_modified} for blob in blob_iterator if blob.size > 0]
+    try:
+        # The aio client pipelines page fetches, which is much faster on
+        # RTT-bound listings; it needs the optional aiohttp transport.
+        from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+    except ImportError:
+        AsyncBlobServiceClient = None
+
+    if AsyncBlobServiceClient is not None:
+        async def _list_blobs():
+            async with AsyncBlobServiceClient.from_connection_string(sas_key) as blob_service_client:
+                container_client = blob_service_client.get_container_client(container_name)
+                return [{'Key': blob.name, 'LastModified': blob.last_modified}
+                        async for blob in container_client.list_blobs(name_starts_with=search_prefix)
+                        if blob.size > 0]
+        yield from asyncio.run(_list_blobs())
+    else:
+        from azure.storage.blob import BlobServiceClient
 
+        blob_service_client = BlobServiceClient.from_connection_string(sas_key)
+        container_client = blob_service_client.get_container_client(container_name)
+        blob_iterator = container_client.list_blobs(name_starts_with=search_prefix)
+        for blob in blob_iterator:
+            if blob.size > 0:
+                yield {'Key': blob.name, 'LastModified': blob.last_modified}
 
 
-def list_files_in_s3_bucket(bucket, search_prefix=None):
-    s3_client = boto3.client('s3')
-    s3_objects = []
 
-    max_results = 1000
+def _list_s3_prefix(s3_client, bucket, prefix):
     args = {
         'Bucket': bucket,
-        'MaxKeys': max_results,
+        'PaginationConfig': {'PageSize': 1000},
     }
-    if search_prefix is not None:
-        args['Prefix'] = search_prefix
-
-    result = s3_client.list_objects_v2(**args)
-    if result['KeyCount'] > 0:
-        s3_objects += result['Contents']
-        next_continuation_token = result.get('NextContinuationToken')
-
-        while next_continuation_token is not None:
-            LOGGER.debug('Continuing pagination with token "{}".'.format(next_continuation_token))
+    if prefix is not None:
+        args['Prefix'] = prefix
 
-            continuation_args = args.copy()
-            continuation_args['ContinuationToken'] = next_continuation_token
+    s3_objects = []
+    # The paginator handles continuation tokens (and their edge cases) for us
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(**args):
+        s3_objects.extend(page.get('Contents', []))
+    return s3_objects
 
-            result = s3_client.list_objects_v2(**continuation_args)
 
-            s3_objects += result['Contents']
-            next_continuation_token = result.get('NextContinuationToken')
+def list_files_in_s3_bucket(bucket, search_prefix=None, concurrency=1):
+    import boto3
 
-    LOGGER.info("Found {} files.".format(len(s3_objects)))
+    s3_client = boto3.client('s3')
+    count = 0
+
+    if concurrency > 1:
+        # Listing is round-trip bound, so fan out one paginator per sub-prefix
+        # (the '/'-delimited level below search_prefix) across a thread pool.
+        sub_prefixes = []
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, Prefix=search_prefix or '', Delimiter='/'):
+            contents = page.get('Contents', [])
+            count += len(contents)
+            yield from contents
+            sub_prefixes.extend(cp['Prefix'] for cp in page.get('CommonPrefixes', []))
+        if sub_prefixes:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(sub_prefixes))) as executor:
+                for objects in executor.map(lambda p: _list_s3_prefix(s3_client, bucket, p), sub_prefixes):
+                    count += len(objects)
+                    yield from objects
+    else:
+        args = {
+            'Bucket': bucket,
+            'PaginationConfig': {'PageSize': 1000},
+        }
+        if search_prefix is not None:
+            args['Prefix'] = search_prefix
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(**args):
+            contents = page.get('Contents', [])
+            count += len(contents)
+            yield from contents
 
-    return s3_objects
+    LOGGER.info("Found {} files.".format(count))
 
 
 def config_by_crawl(crawl_config):
+    import dateutil.parser
+
     config = {'tables': []}
     for source in crawl_config:
         entries = {}
         modified_since = dateutil.parser.parse(source['start_date'] if 'start_date' in source else
                                                "1970-01-01T00:00:00Z")
         target_files = get_matching_objects(source, modified_since=modified_since)
+        # Fields shared by every table spec generated from this source, built once
+        spec_template = {
+            "path": source['path'],
+            "format": "detect",
+            "encoding": source.get('encoding', 'utf-8'),
+            "invalid_format_action": "ignore",
+            "delimiter": "detect",
+            "max_records_per_run": source.get('max_records_per_run', -1),
+            "max_sampled_files": source.get('max_sampled_files', 5),
+            "max_sampling_read": source.get('max_sampling_read', 1000),
+            "universal_newlines": source.get('universal_newlines', True),
+            "prefer_number_vs_integer": source.get('prefer_number_vs_integer', False),
+            "prefer_schema_as_string": source.get('prefer_schema_as_string', False),
+            "start_date": modified_since.isoformat()
+        }
         for file in target_files:
             if not file['key'].endswith('/'):
                 dirs = file['key'].split('/')
@@ -356,47 +491,25 @@ def config_by_crawl(crawl_config):
                 abs_pattern = directory + '/' + rel_pattern + '$'
                 if table not in entries:
                     entries[table] = {
-                        "path": source['path'],
+                        **spec_template,
                         "name": table,
                         "search_prefix": directory,
                         "pattern": abs_pattern,
                         "key_properties": [],
-                        "format": "detect",
-                        "encoding": source.get('encoding', 'utf-8'),
-                        "invalid_format_action": "ignore",
-                        "delimiter": "detect",
-                        "max_records_per_run": source.get('max_records_per_run',-1),
-                        "max_sampled_files": source.get('max_sampled_files', 5),
-                        "max_sampling_read": source.get('max_sampling_read', 1000),
-                        "universal_newlines": source.get('universal_newlines', True),
-                        "prefer_number_vs_integer": source.get('prefer_number_vs_integer', False),
-                        "prefer_schema_as_string": source.get('prefer_schema_as_string', False),
-                        "start_date": modified_since.isoformat()
                     }
                 elif abs_pattern != entries[table]["pattern"]:
                     # We've identified an additional pattern under the same table so give it a unique table name
                     table_with_pattern = re.sub(r'\W+', '', table + '_' + rel_pattern)
                     if table_with_pattern not in entries:
                         entries[table_with_pattern] = {
-                            "path": source['path'],
+                            **spec_template,
                             "name": table_with_pattern,
                             "search_prefix": directory,
                             "pattern": abs_pattern,
                             "key_properties": [],
-                            "format": "detect",
-                            "encoding": source.get('encoding', 'utf-8'),
-                            "invalid_format_action": "ignore",
-                            "delimiter": "detect",
-                            "max_records_per_run": source.get('max_records_per_run', -1),
-                            "max_sampled_files": source.get('max_sampled_files', 5),
-                            "max_sampling_read": source.get('max_sampling_read', 1000),
-                            "universal_newlines": source.get('universal_newlines', True),
-                            "prefer_number_vs_integer": source.get('prefer_number_vs_integer', False),
-                            "prefer_schema_as_string": source.get('prefer_schema_as_string', False),
-                            "start_date": modified_since.isoformat()
                         }
 
             else:
                 LOGGER.debug(f"Skipping config for {file['key']} because it looks like a folder not a file")
         config['tables'] += entries.values()
-        return config
+    return config
@@ -1,11 +1,12 @@
 import smart_open
 
 from codecs import StreamReader
+from functools import lru_cache
+from urllib.parse import urlparse
 import tap_spreadsheets_anywhere.csv_handler
 import tap_spreadsheets_anywhere.excel_handler
 import tap_spreadsheets_anywhere.json_handler
 import tap_spreadsheets_anywhere.jsonl_handler
-from azure.storage.blob import BlobServiceClient
 import os
 
 class InvalidFormatError(Exception):
@@ -18,19 +19,38 @@ class InvalidFormatError(Exception):
         return f'{self.name} could not be parsed: {self.message}'
 
 
-def get_streamreader(uri, universal_newlines=True, newline='', open_mode='r', encoding='utf-8'):
-    kwarg_dispatch = {
-        "azure": lambda: {
-            "transport_params": {
-                "client": BlobServiceClient.from_connection_string(
-                    os.environ['AZURE_STORAGE_CONNECTION_STRING'],
-                )
-            }
-        },
-    }
+@lru_cache(maxsize=None)
+def _azure_blob_service_client():
+    # Imported lazily so the azure SDK is only loaded for azure:// URIs;
+    # cached so credential parsing happens once per process, not per file
+    from azure.storage.blob import BlobServiceClient
 
+    return BlobServiceClient.from_connection_string(
+        os.environ['AZURE_STORAGE_CONNECTION_STRING'],
+    )
+
+
+# 4 MB chunks keep network reads wire-bound instead of round-trip-bound;
+# the stock S3/GCS defaults trigger many more HTTP range requests per file
+_DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _default_transport_params(scheme):
+    if scheme == "s3":
+        return {"buffer_size": _DEFAULT_BUFFER_SIZE}
+    if scheme == "gs":
+        return {"blob_open_kwargs": {"chunk_size": _DEFAULT_BUFFER_SIZE}}
+    if scheme == "azure":
+        return {"client": _azure_blob_service_client()}
+    return {}
+
+
+def get_streamreader(uri, universal_newlines=True, newline='', open_mode='r', encoding='utf-8', transport_params=None):
     SCHEME_SEP = "://"
-    kwargs = kwarg_dispatch.get(uri.split(SCHEME_SEP, 1)[0], lambda: {})()
+    params = _default_transport_params(uri.split(SCHEME_SEP, 1)[0])
+    if transport_params:
+        params.update(transport_params)
+    kwargs = {"transport_params": params} if params else {}
 
     # When reading in binary mode, undefine `encoding`.
     # Otherwise, `smart_open` will return a `TextIOWrapper` in `"r"` mode.
@@ -46,104 +66,92 @@ def get_streamreader(uri, universal_newlines=True, newline='', open_mode='r', en
 
 def monkey_patch_streamreader(streamreader):
     streamreader.mp_newline = '\n'
+    streamreader._mp_buf = ''
     streamreader.readline = mp_readline.__get__(streamreader, StreamReader)
+    streamreader.seek = mp_seek.__get__(streamreader, StreamReader)
     return streamreader
 
 
+def mp_seek(self, offset, whence=0):
+    # The readline buffer holds data from the old stream position, so drop it
+    self._mp_buf = ''
+    return StreamReader.seek(self, offset, whence)
+
+
+_MP_READ_SIZE = 65536
+
+
 def mp_readline(self, size=None, keepends=False):
     """
-        Modified version of readline for StreamReader that avoids the use of splitlines
-        in favor of a call to split(self.mp_newline)
+        Modified version of readline for StreamReader that splits lines only on
+        self.mp_newline rather than the full universal-newline set.
         This supports poorly formatted CSVs that the author has sadly seen in the wild
         from commercial vendors.
+
+        Lines are carved out of a persistent buffer refilled in 64 KB blocks,
+        so the newline scan runs in C (str.find) instead of per-character
+        Python, and network streams are not hit with tiny reads.
     """
-    # If we have lines cached from an earlier read, return
-    # them unconditionally
-    if self.linebuffer:
-        line = self.linebuffer[0]
-        del self.linebuffer[0]
-        if len(self.linebuffer) == 1:
-            # revert to charbuffer mode; we might need more data
-            # next time
-            self.charbuffer = self.linebuffer[0]
-            self.linebuffer = None
-        if not keepends:
-            line = line.split(self.mp_newline)[0]
-        return line
-
-    readsize = size or 72
-    line = self._empty_charbuffer
-    # If size is given, we call read() only once
-    while True:
-        data = self.read(readsize, firstline=True)
-        if data:
-            # If we're at a "\r" read one extra character (which might
-            # be a "\n") to get a proper line ending. If the stream is
-            # temporarily exhausted we return the wrong line ending.
-            if (isinstance(data, str) and data.endswith("\r")) or \
-                    (isinstance(data, bytes) and data.endswith(b"\r")):
-                data += self.read(size=1, chars=1)
-
-        line += data
-        lines = line.split(self.mp_newline)
-        if lines:
-            if len(lines) > 1:
-                # More than one line result; the first line is a full line
-                # to return
-                line = lines[0]
-                del lines[0]
-                if len(lines) > 1:
-                    # cache the remaining lines
-                    lines[-1] += self.charbuffer
-                    self.linebuffer = lines
-                    self.charbuffer = None
-                else:
-                    # only one remaining line, put it back into charbuffer
-                    self.charbuffer = lines[0] + self.charbuffer
-                if not keepends:
-                    line = line.split(self.mp_newline)[0]
-                break
-            line0withend = lines[0]
-            line0withoutend = lines[0].split(self.mp_newline)[0]
-            if line0withend != line0withoutend:  # We really have a line end
-                # Put the rest back together and keep it until the next call
-                self.charbuffer = self._empty_charbuffer.join(lines[1:]) + \
-                                  self.charbuffer
-                if keepends:
-                    line = line0withend
-                else:
-                    line = line0withoutend
-                break
-        # we didn't get anything or this was our only try
-        if not data or size is not None:
-            if line and not keepends:
-                line = line.split(self.mp_newline)[0]
+    sep = self.mp_newline
+    buf = self._mp_buf
+    idx = buf.find(sep)
+    while idx < 0:
+        chunk = self.read(_MP_READ_SIZE)
+        if not chunk:
             break
-        if readsize < 8000:
-            readsize *= 2
+        # Resume the scan where the previous find left off (backing up in
+        # case a multi-character separator straddles the chunk boundary)
+        scan_from = max(0, len(buf) - len(sep) + 1)
+        buf += chunk
+        idx = buf.find(sep, scan_from)
+
+    if idx >= 0:
+        line = buf[:idx + len(sep)] if keepends else buf[:idx]
+        self._mp_buf = buf[idx + len(sep):]
+    else:
+        # No newline left; return the remainder (possibly empty => EOF)
+        line = buf
+        self._mp_buf = ''
     return line
 
 
+# Filename-based format detection as a single suffix lookup; the longest
+# suffixes no longer rely on being checked before their prefixes (.jsonl vs .js)
+_FORMAT_BY_SUFFIX = {
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+    '.jsonl': 'jsonl',
+    '.json': 'json',
+    '.js': 'json',
+    '.csv': 'csv',
+}
+
+
 def get_row_iterator(table_spec, uri):
     universal_newlines = table_spec['universal_newlines'] if 'universal_newlines' in table_spec else True
     encoding = table_spec['encoding'] if 'encoding' in table_spec else 'utf-8'
     skip_initial = table_spec.get("skip_initial", 0)
+    transport_params = table_spec.get("transport_params", None)
 
+    # A reader opened for content sniffing is reused by the text-format
+    # handlers below so network-backed URIs are only opened once
+    reader = None
     if 'format' not in table_spec or table_spec['format'] == 'detect':
-        lowered_uri = uri.lower()
-        if lowered_uri.endswith(".xlsx") or lowered_uri.endswith(".xls"):
-            format = 'excel'
-        elif lowered_uri.endswith(".json") or lowered_uri.endswith(".js"):
-            format = 'json'
-        elif lowered_uri.endswith(".jsonl"):
-            format = 'jsonl'
-        elif lowered_uri.endswith(".csv"):
-            format = 'csv'
-        else:
+        # urlparse keeps query strings and fragments from defeating the match
+        suffix = os.path.splitext(urlparse(uri).path)[1].lower()
+        format = _FORMAT_BY_SUFFIX.get(suffix)
+        if format is None:
             # TODO: some protocols provide the ability to pull format (content-type) info & we could make use of that here
-            reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding)
-            buf = reader.read(10)
-            reader.seek(0)
+            reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding, transport_params=transport_params)
+            # Prefer peeking the underlying byte buffer: it serves the probe
+            # from read-ahead without moving the stream, where seek(0) on a
+            # network-backed reader can cost a fresh range request
+            peek = getattr(getattr(reader, 'buffer', None), 'peek', None)
+            if peek is not None:
+                buf = peek(16).decode(encoding or 'utf-8', errors='replace')[:10]
+            else:
+                buf = reader.read(10)
+                reader.seek(0)
             if len(buf) > 0:
                 if buf[0].lstrip() == "[":
                     format = 'json'
@@ -159,21 +167,26 @@ def get_row_iterator(table_spec, uri):
 
     try:
         if format == 'csv':
-            reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding)
+            if reader is None:
+                reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding, transport_params=transport_params)
             iterator = tap_spreadsheets_anywhere.csv_handler.get_row_iterator(table_spec, reader)
         elif format == 'excel':
+            # Suffix-based detection always resolves excel before sniffing, so
+            # no text reader is open here and the binary open is the only one
             if uri.lower().endswith(".xls"):
-                reader = get_streamreader(uri, universal_newlines=universal_newlines,newline=None, open_mode='rb')
+                reader = get_streamreader(uri, universal_newlines=universal_newlines,newline=None, open_mode='rb', transport_params=transport_params)
                 iterator = tap_spreadsheets_anywhere.excel_handler.get_legacy_row_iterator(table_spec, reader)
             else:
                 # If encoding is set, smart_open will override binary mode ('b' in open_mode) and it will result in a BadZipFile error
-                reader = get_streamreader(uri, universal_newlines=universal_newlines,newline=None, open_mode='rb', encoding=None)
+                reader = get_streamreader(uri, universal_newlines=universal_newlines,newline=None, open_mode='rb', encoding=None, transport_params=transport_params)
                 iterator = tap_spreadsheets_anywhere.excel_handler.get_row_iterator(table_spec, reader)
         elif format == 'json':
-            reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding)
+            if reader is None:
+                reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding, transport_params=transport_params)
             iterator = tap_spreadsheets_anywhere.json_handler.get_row_iterator(table_spec, reader)
         elif format == 'jsonl':
-            reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding)
+            if reader is None:
+                reader = get_streamreader(uri, universal_newlines=universal_newlines, open_mode='r', encoding=encoding, transport_params=transport_params)
             iterator = tap_spreadsheets_anywhere.jsonl_handler.get_row_iterator(table_spec, reader)
     except (ValueError,TypeError) as err:
         raise InvalidFormatError(uri,message=err)
@@ -184,3 +197,32 @@ def get_row_iterator(table_spec, uri):
             next(iterator)
 
     return iterator
+
+
+def _collect_rows(table_spec, uri):
+    return list(get_row_iterator(table_spec, uri))
+
+
+def get_row_iterator_many(table_spec, uris, workers=None):
+    """Yield parsed rows from many URIs, downloading and parsing files in
+    parallel worker processes.
+
+    Files are yielded in the order given (rows within a file keep their
+    order), so output is deterministic; the workers simply run ahead of the
+    consumer. Each file's rows are materialized in its worker before being
+    sent back, so this is intended for many moderate files rather than one
+    enormous one."""
+    uris = list(uris)
+    if workers is None:
+        workers = min(len(uris), (os.cpu_count() or 1) * 2)
+    if workers <= 1 or len(uris) <= 1:
+        for uri in uris:
+            yield from get_row_iterator(table_spec, uri)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rows in executor.map(partial(_collect_rows, table_spec), uris):
+            yield from rows
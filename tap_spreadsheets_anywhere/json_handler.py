@@ -1,60 +1,158 @@
-import json
 import re
+from functools import lru_cache
 from json import JSONDecodeError
 from jsonpath_ng.ext import parse
 import logging
 
+try:
+    # orjson parses in native code, typically 2-5x faster than stdlib json;
+    # its JSONDecodeError subclasses the stdlib one so except clauses still match
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+try:
+    # ijson stream-parses arrays so memory stays O(one record) instead of O(file)
+    import ijson
+except ImportError:
+    ijson = None
+
 LOGGER = logging.getLogger(__name__)
 
+# stdlib json reports trailing NDJSON content as "Extra data"; orjson calls it
+# "unexpected content after document"
+_EXTRA_DATA_MSGS = ("Extra data", "unexpected content after document")
+
+# One C-level translate pass replaces the per-key "[^\w\s]" regex scan.
+# The table only covers the BMP; keys containing astral codepoints (emoji
+# and the like) take the regex path below so output matches it exactly.
+_PUNCT_DROP_TABLE = {codepoint: None for codepoint in range(0x10000)
+                     if not (chr(codepoint).isalnum() or chr(codepoint) == '_' or chr(codepoint).isspace())}
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_WS_RUN_RE = re.compile(r"\s+")
+
+
+def _sanitize_key(key):
+    # Already-clean keys (snake_case with no punctuation or whitespace) are the
+    # common case; a pair of C-level predicates beats the translate/regex pass
+    if key.isidentifier() and key.islower():
+        return key
+    # remove non-word, non-whitespace characters then collapse whitespace runs to underscores
+    if key and max(key) > '\uffff':
+        key = _NON_WORD_RE.sub('', key)
+    else:
+        key = key.translate(_PUNCT_DROP_TABLE)
+    return _WS_RUN_RE.sub('_', key).lower()
+
 
 def generator_wrapper(root_iterator, table_spec):
+    # Invariants and hot globals resolved once; LOAD_FAST beats LOAD_GLOBAL
+    # at millions of rows
+    skip_empty_rows = table_spec.get("skip_empty_rows", False)
+    sanitize = _sanitize_key
+    # JSON files repeat the same keys row after row, so each distinct raw key
+    # is sanitized only once and looked up from this map thereafter
+    key_map = {}
+    known_keys = key_map.keys()
+    # While every key seen so far sanitizes to itself, rows pass through
+    # untouched — no per-row dict rebuild at all
+    identity = True
     for obj in root_iterator:
-        if table_spec.get("skip_empty_rows", False) and all(value == None or value == '' for value in obj.values()):
-            continue
-        to_return = {}
         if isinstance(obj, list):
-            # get json obj from list, yield each one
-            my_list = obj
-            for obj in my_list:
-                yield obj
+            # a nested list of records: yield each one as its own row
+            yield from obj
+            continue
+        if skip_empty_rows and all(value is None or value == '' for value in obj.values()):
+            continue
+        if not obj.keys() <= known_keys:
+            # First row with unmapped keys: sanitize and record them
+            for key in obj:
+                if key not in key_map:
+                    formatted_key = sanitize('_smart_extra' if key is None else key)
+                    key_map[key] = formatted_key
+                    if formatted_key != key:
+                        identity = False
+        if identity:
+            yield obj
+        else:
+            yield {key_map[key]: value for key, value in obj.items()}
 
-        for key, value in obj.items():
-            if key is None:
-                key = "_smart_extra"
 
-            formatted_key = key
-            # remove non-word, non-whitespace characters
-            formatted_key = re.sub(r"[^\w\s]", "", formatted_key)
-            # replace whitespace with underscores
-            formatted_key = re.sub(r"\s+", "_", formatted_key)
-            to_return[formatted_key.lower()] = value
-        yield to_return
+def get_row_iterator(table_spec, reader):
+    json_path = table_spec.get("json_path", None)
 
+    # Stream only the unambiguous case: a top-level array with no json_path.
+    # A json_path target may be an object rather than an array, which ijson's
+    # '.item' prefix would silently skip, so those go through load-then-extract.
+    if ijson is not None and json_path is None:
+        head = reader.read(64)
+        reader.seek(0)
+        if head.lstrip()[:1] == '[':
+            # Hand ijson the underlying byte buffer when the text layer is
+            # plain UTF-8 so it skips a decode/re-encode round-trip
+            encoding = (getattr(reader, 'encoding', None) or 'utf-8').lower().replace('-', '')
+            source = getattr(reader, 'buffer', None) if encoding == 'utf8' else None
+            if source is None:
+                source = reader
+            else:
+                source.seek(0)
+
+            def stream_items(items=ijson.items(source, 'item'), _reader=reader):
+                # _reader is captured so the text layer (and the buffer it
+                # owns) stays open for the life of the stream
+                emitted = 0
+                try:
+                    try:
+                        for item in items:
+                            yield item
+                            emitted += 1
+                    except ijson.common.JSONError as err:
+                        if 'trailing garbage' not in str(err):
+                            raise
+                        # Content after the first document: a file of
+                        # concatenated arrays. Re-parse per line like the
+                        # eager "Extra data" fallback, skipping the rows
+                        # already streamed out of the first document.
+                        _reader.seek(0)
+                        for jobj in _reader:
+                            doc = _loads(jobj)
+                            if emitted and isinstance(doc, list):
+                                doc = doc[emitted:]
+                            emitted = 0
+                            yield doc
+                except (ijson.common.JSONError, JSONDecodeError) as err:
+                    # These surface during iteration, after format_handler's
+                    # ValueError wrapping has already returned, so translate
+                    # here to keep invalid_format_action working
+                    from tap_spreadsheets_anywhere.format_handler import InvalidFormatError
+                    raise InvalidFormatError(getattr(_reader, 'name', '<stream>'), message=str(err)) from err
+            return generator_wrapper(stream_items(), table_spec)
 
-def get_row_iterator(table_spec, reader):
     try:
-        json_array = json.load(reader)
-        json_path = table_spec.get("json_path", None)
+        json_array = _loads(reader.read())
         if json_path is not None:
             json_array = extract_jsonpath(json_path, json_array)
-            # LOGGER.info(type(json_array))
-            # LOGGER.info(json_array)
-            for i in json_array:
-                LOGGER.info(i)
 
         # throw a TypeError if the root json object can not be iterated
         return generator_wrapper(iter(json_array), table_spec)
     except JSONDecodeError as jde:
-        if jde.msg.startswith("Extra data"):
+        if jde.msg.startswith(_EXTRA_DATA_MSGS):
             reader.seek(0)
             json_objects = []
             for jobj in reader:
-                json_objects.append(json.loads(jobj))
+                json_objects.append(_loads(jobj))
             return generator_wrapper(json_objects, table_spec)
         else:
             raise jde
 
 
+@lru_cache(maxsize=128)
+def _compile_jsonpath(expression):
+    # jsonpath_ng builds its AST through a PLY parser, which is expensive;
+    # table specs reuse the same expression across files, so compile once
+    return parse(expression)
+
+
 def extract_jsonpath(expression, input):
     """Extract records from an input based on a JSONPath expression.
 
@@ -62,4 +160,5 @@ def extract_jsonpath(expression, input):
         expression: JSONPath expression to match against the input.
         input: JSON object or array to extract records from.
     """
-    return [match.value for match in parse(expression).find(input)]
+    # find() itself returns a full list; the genexpr just avoids a second copy
+    return (match.value for match in _compile_jsonpath(expression).find(input))
@@ -1,38 +1,96 @@
-import json
 import re
 from json import JSONDecodeError
 import logging
 
+try:
+    # orjson parses in native code, typically 2-5x faster than stdlib json;
+    # its JSONDecodeError subclasses the stdlib one so except clauses still match
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 LOGGER = logging.getLogger(__name__)
 
+# One C-level translate pass replaces the per-key "[^\w\s]" regex scan.
+# The table only covers the BMP; keys containing astral codepoints (emoji
+# and the like) take the regex path below so output matches it exactly.
+_PUNCT_DROP_TABLE = {codepoint: None for codepoint in range(0x10000)
+                     if not (chr(codepoint).isalnum() or chr(codepoint) == '_' or chr(codepoint).isspace())}
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_WS_RUN_RE = re.compile(r"\s+")
+
+
+def _sanitize_key(key):
+    # Already-clean keys (snake_case with no punctuation or whitespace) are the
+    # common case; a pair of C-level predicates beats the translate/regex pass
+    if key.isidentifier() and key.islower():
+        return key
+    # remove non-word, non-whitespace characters then collapse whitespace runs to underscores
+    if key and max(key) > '\uffff':
+        key = _NON_WORD_RE.sub('', key)
+    else:
+        key = key.translate(_PUNCT_DROP_TABLE)
+    return _WS_RUN_RE.sub('_', key).lower()
+
+
 def generator_wrapper(root_iterator, table_spec):
+    # Invariants and hot globals resolved once; LOAD_FAST beats LOAD_GLOBAL
+    # at millions of rows
+    skip_empty_rows = table_spec.get("skip_empty_rows", False)
+    loads = _loads
+    # JSONL files repeat the same keys row after row, so each distinct raw key
+    # is sanitized only once and looked up from this map thereafter
+    key_map = {}
+    known_keys = key_map.keys()
+    # While every key seen so far sanitizes to itself, rows pass through
+    # untouched — no per-row dict rebuild at all
+    identity = True
     for obj in root_iterator:
-        json_obj = json.loads(obj)
-        if table_spec.get("skip_empty_rows", False) and all(value == None or value == '' for value in obj.values()):
+        json_obj = loads(obj)
+        if skip_empty_rows and all(value is None or value == '' for value in json_obj.values()):
             continue
-        to_return = {}
-        for key, value in json_obj.items():
-            if key is None:
-                key = '_smart_extra'
+        if not json_obj.keys() <= known_keys:
+            # First row with unmapped keys: sanitize and record them
+            for key in json_obj:
+                if key not in key_map:
+                    formatted_key = _sanitize_key('_smart_extra' if key is None else key)
+                    key_map[key] = formatted_key
+                    if formatted_key != key:
+                        identity = False
+        if identity:
+            yield json_obj
+        else:
+            yield {key_map[key]: value for key, value in json_obj.items()}
+
+
+_READ_BLOCK_SIZE = 1 << 20
+
 
-            formatted_key = key
-            # remove non-word, non-whitespace characters
-            formatted_key = re.sub(r"[^\w\s]", '', formatted_key)
-            # replace whitespace with underscores
-            formatted_key = re.sub(r"\s+", '_', formatted_key)
-            to_return[formatted_key.lower()] = value
-        yield to_return
+def _lines(reader):
+    # Bulk 1 MB reads split with C-level str.split instead of a Python
+    # readline call (and its per-character newline scan) for every row
+    tail = ''
+    read = reader.read
+    while True:
+        chunk = read(_READ_BLOCK_SIZE)
+        if not chunk:
+            if tail:
+                yield tail
+            return
+        parts = (tail + chunk).split('\n')
+        tail = parts.pop()
+        yield from parts
 
 
 def get_row_iterator(table_spec, reader):
     try:
-        return generator_wrapper(iter(reader), table_spec)
+        return generator_wrapper(_lines(reader), table_spec)
     except JSONDecodeError as jde:
         if jde.msg.startswith("Extra data"):
             reader.seek(0)
             json_objects = []
-            for jobj in reader:
-                json_objects.append(json.loads(jobj))
+            for jobj in _lines(reader):
+                json_objects.append(_loads(jobj))
             return generator_wrapper(json_objects, table_spec)
         else:
             raise jde
@@ -121,3 +121,14 @@ class TestJsonFormatHandler(unittest.TestCase):
             row_count += 1
             self.assertEqual(3884, row['id'], f"ID field is {row['id']} - expected it to be 3884.")
         self.assertEqual(expected_row_count, row_count, f"Expected row_count to be {expected_row_count} but was {row_count}")
+
+    def test_row_iterator_many(self):
+        test_filename_uris = ['./tap_spreadsheets_anywhere/test/sample-jsonl.json',
+                              './tap_spreadsheets_anywhere/test/sample-jsonl.json']
+        iterator = format_handler.get_row_iterator_many(TEST_TABLE_SPEC['tables'][2], test_filename_uris, workers=2)
+        expected_row_count = 12
+        row_count = 0
+        for row in iterator:
+            row_count += 1
+            self.assertIsNotNone(row['id'], f"ID field is None for row {row}")
+        self.assertEqual(expected_row_count, row_count, f"Expected row_count to be {expected_row_count} but was {row_count}")